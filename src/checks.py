@@ -12,16 +12,19 @@ import json
 import logging
 from math import isfinite
 from numbers import Real, Integral
-import pygame
-from typing import Any, Optional, TextIO
+from types import ModuleType
+from typing import Any, List, Optional, TextIO
 
 # Initialize modules
 logger: logging.Logger = logging.getLogger(__name__)
 
+# PyGame is only needed by is_valid_pygame_color, so it is imported on first use to keep this module light.
+_pygame: Optional[ModuleType] = None
+
 def only_contains_type(sequence: Sequence,
                   kind: type) -> bool:
     """
-    Checks if a sequence only contains a certain type.
+    Checks if a sequence only contains a certain type. Types must match exactly, so subclasses are not counted.
 
     Args:
         sequence (Sequence): The sequence to check.
@@ -41,16 +44,20 @@ def only_contains_type(sequence: Sequence,
         True
         >>> only_contains_type(["abc", 123, True], str)
         False
+        >>> only_contains_type([1, True], int)
+        False
     """
 
     if not is_sequence(sequence):
-        raise TypeError(f"A sequence is required. Given type: {sequence.__class__.__name__}")
+        raise TypeError(f"A sequence is required. Given type: {type(sequence).__name__}")
     if not sequence:
         logger.warning("Attempted to check an empty sequence")
         return False
     if not isinstance(kind, type):
         raise TypeError(f"kind must be a type. Given type: {type(kind)}")
 
+    # Exact type match, so subclasses (e.g. bool for int) are rejected. isinstance() is not used because it would
+    # accept them.
     for item in sequence:
         if type(item) is not kind:
             return False
@@ -99,6 +106,9 @@ def is_integer(value: Any) -> bool:
         False
     """
 
+    # Fast path for the common exact type before the slower abstract base class check
+    if value.__class__ is int:
+        return True
     return isinstance(value, Integral) and not isinstance(value, bool)
 
 def is_real_number(value: Any) -> bool:
@@ -122,7 +132,13 @@ def is_real_number(value: Any) -> bool:
         False
     """
 
-    return isinstance(value, Real) and not isinstance(value, bool) and isfinite(value)
+    # Fast paths for the common exact types before the slower abstract base class check. Integers are always finite.
+    kind: type = value.__class__
+    if kind is int:
+        return True
+    if kind is float:
+        return isfinite(value)
+    return kind is not bool and isinstance(value, Real) and isfinite(value)
 
 def is_positive(value: Real,
                 zero_is_positive: bool = False) -> bool:
@@ -149,7 +165,14 @@ def is_positive(value: Real,
         ValueError
     """
 
-    if not is_real_number(value):
+    # Same check as is_real_number(), inlined to avoid an extra function call
+    kind: type = value.__class__
+    if kind is float:
+        is_valid: bool = isfinite(value)
+    else:
+        is_valid: bool = kind is int or (kind is not bool and isinstance(value, Real) and isfinite(value))
+
+    if not is_valid:
         raise ValueError(f"is_positive() requires a finite real number value (not including booleans or infinity). "
                          f"Value given: {value}")
 
@@ -188,7 +211,7 @@ def is_sequence(value: Any,
     if size is not None:
         if not isinstance(size, int):
             raise TypeError(f"Size argument must be an integer. Given type: {type(size)}")
-        if not is_positive(size):
+        if size.__class__ is bool or size <= 0:
             raise ValueError(f"Size argument must be positive. Given value: {size}")
 
     # Returns False if value is not a sequence. Otherwise, if size is given, returns length
@@ -217,9 +240,15 @@ def is_valid_pygame_color(value: Any) -> bool:
         False
     """
 
+    global _pygame
+
+    if _pygame is None:
+        import pygame
+        _pygame = pygame
+
     # Attempt to create a color from the given value. If no error is raised, True is returned. Otherwise, False.
     try:
-        pygame.Color(value)
+        _pygame.Color(value)
         return True
     except (ValueError, TypeError):
         return False
@@ -240,17 +269,23 @@ def has_duplicate_values(sequence: Sequence[Any]) -> bool:
     """
 
     if not isinstance(sequence, Sequence):
-        raise TypeError(f"Requires a sequence type. Given type: {sequence.__class__.__name__}")
+        raise TypeError(f"Requires a sequence type. Given type: {type(sequence).__name__}")
     if not sequence:
         logger.warning("Attempted to search for duplicates in an empty sequence.")
         return False
 
-    seen = set()
+    # Hashable values can be checked in a single pass by set(). Unhashable values fall back to a manual search.
+    try:
+        return len(set(sequence)) != len(sequence)
+    except TypeError:
+        pass
+
+    seen: List[Any] = []
 
     for item in sequence:
         if item in seen:
             return True
-        seen.add(item)
+        seen.append(item)
 
     return False
 
@@ -293,7 +328,7 @@ def hasinstance(obj: object,
     """
 
     if not isinstance(kind, type):
-        raise TypeError(f"Kind argument must be a type. Type given: {kind.__class__.__name__}")
+        raise TypeError(f"Kind argument must be a type. Type given: {type(kind).__name__}")
 
     if isinstance(obj, kind):
         return True
@@ -302,6 +337,6 @@ def hasinstance(obj: object,
             if isinstance(attr, kind):
                 return True
     else:
-        logger.warning(f"Object {obj.__class__.__name__} has no attributes.")
+        logger.warning("Object %s has no attributes.", type(obj).__name__)
 
     return False
\ No newline at end of file
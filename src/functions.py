@@ -4,22 +4,41 @@ functions.py
 This file holds all the independent helper functions used within the program logic
 """
 
-from checks import (is_boolean, is_integer, is_positive, is_real_number, has_duplicate_values, only_contains_type,
-                    validate_json, is_sequence, hasinstance)
+from checks import is_boolean, is_integer, is_positive, is_real_number, is_sequence
+from copy import deepcopy
+from functools import lru_cache
 import json
 import logging
 from numbers import Real
-import os
 from pathlib import Path
 import pygame
 from typing import Any, Dict, List, Optional, Tuple
 
+# orjson is faster at parsing settings files. It is optional; the standard library is used if it is not installed.
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
 current_dir: Path = Path(__file__).resolve().parent
+_SETTINGS_DIR: Path = current_dir / "Settings"
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Size of the display, cached by get_display_size()
+_display_size_cache: Optional[Tuple[int, int]] = None
+
+# Tolerance used by scale_image() when snapping a scale to the nearest whole number
+_SCALE_EPSILON: float = 1e-9
+
+# Maps lowercase key names to PyGame key constants, e.g. "a" -> pygame.K_a and "escape" -> pygame.K_ESCAPE.
+# Built once at import so load_controls() does a single dictionary lookup per key.
+_PYGAME_KEYS: Dict[str, int] = {name[2:].lower(): value for name, value in vars(pygame).items()
+                                if name.startswith("K_") and isinstance(value, int)}
+
 def get_display_size() -> Tuple[int, int]:
     """
-    Returns the size of the current display (in pixels).
+    Returns the size of the current display (in pixels). The size is cached after the first call; use
+    invalidate_display_size() if the display changes.
 
     Returns:
         Tuple[int, int]: Tuple representing screen width and height.
@@ -27,6 +46,10 @@ def get_display_size() -> Tuple[int, int]:
     Raises:
         warning: If the display module is not initialized. It will initialize it for you.
     """
+    global _display_size_cache
+
+    if _display_size_cache is not None:
+        return _display_size_cache
 
     # Ensure display is initialized
     if not pygame.display.get_init():
@@ -36,9 +59,21 @@ def get_display_size() -> Tuple[int, int]:
         pygame.display.init()
 
     display_info: pygame.display.Info = pygame.display.Info()
-    size: tuple[int, int] = display_info.current_w, display_info.current_h
+    _display_size_cache = display_info.current_w, display_info.current_h
+
+    return _display_size_cache
 
-    return size
+def invalidate_display_size() -> None:
+    """
+    Clears the cached display size so the next get_display_size() call queries the display again. Call this when the
+    display changes, such as on pygame.VIDEORESIZE.
+
+    Returns:
+        None
+    """
+    global _display_size_cache
+
+    _display_size_cache = None
 
 def load_controls(controls: Dict[str, str]) -> Dict[str, int]:
     """
@@ -53,25 +88,19 @@ def load_controls(controls: Dict[str, str]) -> Dict[str, int]:
     pygame_dict: Dict[str, int] = {}
 
     for action, key in controls.items():
-        # PyGame key constants are lowercase if it is a letter and uppercase if it is a word, like escape or return
-        if len(key) == 1:
-            key_name: str = f"K_{key.lower()}"
-        else:
-            key_name: str = f"K_{key.upper()}"
-
         # Ensure that the key name is valid.
-        if not hasattr(pygame, key_name):
-            raise ValueError(f"Invalid key name. Name given: pygame.K_{key_name}")
-        else:
-            pygame_key: int = getattr(pygame, key_name)
-            pygame_dict[action] = pygame_key
+        pygame_key: Optional[int] = _PYGAME_KEYS.get(key.lower())
+        if pygame_key is None:
+            raise ValueError(f"Invalid key name. Name given: {key}")
+
+        pygame_dict[action] = pygame_key
 
     return pygame_dict
 
 def load_settings(name: str) -> Dict[str, Any]:
     """
     Loads a JSON file from the Settings with the name {name}.json and returns the settings as a Python
-    dictionary.
+    dictionary. Files are only read once; later calls return a copy of the cached settings.
 
     Args:
         name (str): Name of the json file. Do not include '.json'.
@@ -83,20 +112,54 @@ def load_settings(name: str) -> Dict[str, Any]:
         FileNotFoundError: If the JSON file does not exist in src/Settings.
         JSONDecodeError: If the JSON file is formatted incorrectly.
     """
-    logger.debug(f"Settings being loaded for {name}.json")
 
-    path: Path = current_dir / "Settings" / f"{name}.json"
+    # Copy the cached settings so callers cannot modify them for everyone else
+    return deepcopy(_read_settings(name))
 
-    if not os.path.exists(str(path)):
-        raise FileNotFoundError(f"JSON does not exist. Path given: {path}")
+def invalidate_settings() -> None:
+    """
+    Clears the settings cache so the next load_settings() call reads from disk again.
+
+    Returns:
+        None
+    """
+
+    _read_settings.cache_clear()
+    logger.debug("Settings cache cleared")
+
+@lru_cache(maxsize=None)
+def _read_settings(name: str) -> Dict[str, Any]:
+    """
+    Reads and parses a settings file. Results are cached by name. Use load_settings() instead.
+
+    Args:
+        name (str): Name of the json file. Do not include '.json'.
 
-    with path.open("r", encoding="utf-8") as file:
-        validate_json(file)
+    Returns:
+        Dict[str, Any]: Dictionary matching setting names and values.
 
-        settings: Dict[str, Any] = json.load(file)
+    Raises:
+        FileNotFoundError: If the JSON file does not exist in src/Settings.
+        JSONDecodeError: If the JSON file is formatted incorrectly.
+    """
+    logger.debug("Settings being loaded for %s.json", name)
 
-    logger.debug(f"Settings for {name}: {settings}")
-    logger.info(f"Settings loaded for {name}")
+    path: Path = _SETTINGS_DIR / f"{name}.json"
+
+    if not path.is_file():
+        raise FileNotFoundError(f"JSON does not exist. Path given: {path}")
+
+    # Parse the file once. Decoding errors are re-raised with the file path. orjson.JSONDecodeError is a subclass of
+    # json.JSONDecodeError, so both parsers are handled here.
+    try:
+        settings: Dict[str, Any] = _json.loads(path.read_bytes())
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(f"{path} is not a valid JSON file", e.doc, e.pos) from e
+
+    # The settings may be large, so skip formatting them entirely unless debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Settings for %s: %s", name, settings)
+    logger.info("Settings loaded for %s", name)
 
     return settings
 
@@ -127,10 +190,18 @@ def load_sprite_sheet(sheet: pygame.Surface,
         raise TypeError(f"Sprite sheet must be a Surface. Type given: {sheet.__class__.__name__}")
     if not is_sequence(sprite_names):
         raise TypeError(f"Sprite names must be a sequence. Type given: {sprite_names.__class__.__name__}")
-    if has_duplicate_values(sprite_names):
-        raise ValueError("Sprite names cannot contain duplicate values.")
-    if not only_contains_type(sprite_names, str):
+    if not sprite_names:
         raise ValueError("Sprite names must be a sequence of only strings.")
+
+    # Check the types and duplicates of the sprite names in a single pass
+    seen_names: set[str] = set()
+    for sprite_name in sprite_names:
+        if type(sprite_name) is not str:
+            raise ValueError("Sprite names must be a sequence of only strings.")
+        if sprite_name in seen_names:
+            raise ValueError("Sprite names cannot contain duplicate values.")
+        seen_names.add(sprite_name)
+
     if not is_integer(sprite_width):
         raise TypeError(f"Sprite width must be an integer. Type given: {sprite_width.__class__.__name__}")
     if not is_positive(sprite_width):
@@ -151,7 +222,6 @@ def load_sprite_sheet(sheet: pygame.Surface,
                          f"Sprite height: {sprite_height}, sheet height: {sheet_height}")
 
     num_animations: int = sheet_height // sprite_height
-    num_sprites: int = sheet_width // sprite_width
 
     if len(sprite_names) != num_animations:
         raise ValueError(f"The number of animations, {num_animations}, must match the number "
@@ -159,19 +229,16 @@ def load_sprite_sheet(sheet: pygame.Surface,
 
     sprite_dict: Dict[str, List[pygame.Surface]] = {}
 
-    for animation_index in range(num_animations):
-        current_animation: str = sprite_names[animation_index]
-        sprite_dict[current_animation] = []
+    # The column offsets are the same for every row, so they are only computed once. subsurface() accepts a plain
+    # tuple, which avoids creating a Rect for each sprite.
+    x_offsets: range = range(0, sheet_width, sprite_width)
+    subsurface = sheet.subsurface
 
+    for animation_index, current_animation in enumerate(sprite_names):
         y_offset: int = animation_index * sprite_height
 
-        for sprite_index in range(num_sprites):
-            x_offset: int = sprite_index * sprite_width
-
-            rect: pygame.Rect = pygame.Rect(x_offset, y_offset, sprite_width, sprite_height)
-            sprite: pygame.Surface = sheet.subsurface(rect).copy()
-
-            sprite_dict[current_animation].append(sprite)
+        sprite_dict[current_animation] = [subsurface((x_offset, y_offset, sprite_width, sprite_height)).copy()
+                                          for x_offset in x_offsets]
 
     return sprite_dict
 
@@ -203,6 +270,12 @@ def scale_image(image: pygame.Surface,
     if not is_boolean(is_smooth):
         raise TypeError(f"is_smooth must be a boolean. Given value: {is_smooth}")
 
+    # Snap scales that are within floating point error of a whole number, e.g. 1.9999999999 to 2. This keeps the
+    # identity fast path working for computed scales and stops int() from truncating the new size by a pixel.
+    nearest_whole: int = round(scale)
+    if abs(scale - nearest_whole) < _SCALE_EPSILON:
+        scale = nearest_whole
+
     if scale == 1:
         return image
 
@@ -221,8 +294,8 @@ def scale_image(image: pygame.Surface,
     else:
         scaled_image: pygame.Surface = pygame.transform.scale(image, new_size)
 
-    logger.debug(f"Image scaled from ({image_width}, {image_height}) to ({new_width}, {new_height}). "
-                 f"Smooth={is_smooth}")
+    logger.debug("Image scaled from (%d, %d) to (%d, %d). Smooth=%s",
+                 image_width, image_height, new_width, new_height, is_smooth)
 
     return scaled_image
 
@@ -242,20 +315,17 @@ def get_collision(obj1: object,
         AttributeError: Obj1/2 does not have a rect or mask in its attributes.
     """
 
-    if not hasinstance(obj1, pygame.Rect):
+    rect1, mask1 = _extract_rect_mask(obj1)
+    if rect1 is None:
         raise AttributeError(f"Object 1 must have a rect.")
-    if not hasinstance(obj1, pygame.Mask):
+    if mask1 is None:
         raise AttributeError(f"Object 1 must have a mask.")
-    if not hasinstance(obj2, pygame.Rect):
+    rect2, mask2 = _extract_rect_mask(obj2)
+    if rect2 is None:
         raise AttributeError(f"Object 2 must have a rect.")
-    if not hasinstance(obj2, pygame.Mask):
+    if mask2 is None:
         raise AttributeError(f"Object 2 must have a mask.")
 
-    rect1: pygame.Rect = getinstance(obj1, pygame.Rect)
-    rect2: pygame.Rect = getinstance(obj2, pygame.Rect)
-    mask1: pygame.Mask = getinstance(obj1, pygame.Mask)
-    mask2: pygame.Mask = getinstance(obj2, pygame.Mask)
-
     dx = rect2.x - rect1.x
     dy = rect2.y - rect1.y
     offset = (dx, dy)
@@ -287,7 +357,7 @@ def getinstance(obj: object,
     """
 
     if not hasattr(obj, "__dict__"):
-        logger.warning(f"Object {obj.__class__.__name__} has no attributes.")
+        logger.warning("Object %s has no attributes.", obj.__class__.__name__)
         return None
 
     if isinstance(obj, kind):
@@ -296,5 +366,29 @@ def getinstance(obj: object,
         if isinstance(attr, kind):
             return attr
 
-    logger.warning(f"Object {obj.__class__.__name__} has no attribute with type {kind.__class__.__name__}")
-    return None
\ No newline at end of file
+    logger.warning("Object %s has no attribute with type %s", obj.__class__.__name__, kind.__name__)
+    return None
+
+def _extract_rect_mask(obj: object) -> Tuple[Optional[pygame.Rect], Optional[pygame.Mask]]:
+    """
+    Finds the first rect and mask in an object's attributes with a single pass.
+
+    Args:
+        obj (object): The object to search.
+
+    Returns:
+        Tuple[Optional[pygame.Rect], Optional[pygame.Mask]]: The rect and mask. Either is None if it was not found.
+    """
+
+    rect: Optional[pygame.Rect] = None
+    mask: Optional[pygame.Mask] = None
+
+    for attr in getattr(obj, "__dict__", {}).values():
+        if rect is None and isinstance(attr, pygame.Rect):
+            rect = attr
+        elif mask is None and isinstance(attr, pygame.Mask):
+            mask = attr
+        if rect is not None and mask is not None:
+            break
+
+    return rect, mask
\ No newline at end of file
@@ -21,10 +21,15 @@ logging.basicConfig(
 logger: logging.Logger = logging.getLogger(__name__)
 logger.info("Imports finished")
 
+# Set when a SIGTERM is received. The program loop is stopped and main() handles cleanup and the exit code, so
+# shutdown only happens once.
+_shutdown_requested: bool = False
+_program: Optional[Program] = None
+
 def handle_sigterm(signum: int,
                    frame: Optional[FrameType]) -> None:
     """
-    Handles a forced closing.
+    Handles a forced closing by asking the program loop to stop.
 
     Args:
         signum (int): Number of the sigterm.
@@ -33,16 +38,16 @@ def handle_sigterm(signum: int,
     Returns:
         None
     """
+    global _shutdown_requested
 
     # Get the program ID
     caller_pid: int = os.getpid()
     logger.warning(f"Received SIGTERM from process {caller_pid}, attempting shutdown...")
 
-    # Exit modules
-    logging.shutdown()
-
-    # Exit program
-    sys.exit(130)
+    # Stop the program loop. It exits at the end of the current frame.
+    _shutdown_requested = True
+    if _program is not None:
+        _program.shutdown_requested = True
 
 # Ensure sigterm is handled
 signal.signal(signal.SIGTERM, handle_sigterm)
@@ -56,10 +61,18 @@ def main() -> int:
         int: The exit code of the program.
     """
 
+    global _program
+
     try:
         with Program() as program:
-            # If exited properly, run() will return 0
-            exit_code: int = program.run()
+            _program = program
+
+            # If exited properly, run() will return 0. Skipped if a SIGTERM arrived during initialization.
+            exit_code: int = 0 if _shutdown_requested else program.run()
+
+        # Exit code 130 is also used for a forced closing.
+        if _shutdown_requested:
+            exit_code = 130
     except KeyboardInterrupt:
         logger.warning("Program interrupted")
 
@@ -71,6 +84,7 @@ def main() -> int:
         # Exit code 1 means an error occurred
         exit_code = 1
     finally:
+        _program = None
         logger.info("Shutting down...")
 
         # Exit modules
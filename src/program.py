@@ -6,18 +6,30 @@ updating objects, and drawing to the screen.
 """
 
 # Import modules
-from src.checks import is_boolean, is_integer, is_positive, is_sequence, is_valid_pygame_color
-from src.functions import load_settings, get_display_size
+from checks import is_boolean, is_integer, is_positive, is_sequence, is_valid_pygame_color
+from functions import load_settings, get_display_size, invalidate_display_size
 import logging
 import pygame
-from states import StateManager
+from pygame import (APP_DIDENTERFOREGROUND, APP_WILLENTERBACKGROUND, FULLSCREEN, NOEVENT, QUIT, SCALED,
+                    WINDOWMINIMIZED, WINDOWRESTORED)
+from states import State, StateManager
 from types import TracebackType
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 # Initialize modules
 logger: logging.Logger = logging.getLogger(__name__)
 pygame.init()
 
+# Most time (in seconds) that can be carried over to the next frame's updates
+MAX_ACCUMULATED_TIME: float = 0.25
+
+# Longest time (in milliseconds) to wait for an event while the program is in the background
+BACKGROUND_WAIT_MS: int = 200
+
+# Events that move the program in and out of the background
+BACKGROUND_EVENTS: Tuple[int, ...] = (WINDOWMINIMIZED, APP_WILLENTERBACKGROUND)
+FOREGROUND_EVENTS: Tuple[int, ...] = (WINDOWRESTORED, APP_DIDENTERFOREGROUND)
+
 # Define Program class
 class Program:
     """
@@ -26,8 +38,14 @@ class Program:
 
     Attr:
         screen (Surface) - Program window.
+        background (Surface) - Pre-rendered background, the size of the screen, used to clear each frame.
         dt (float) - Time (in seconds) since clock.tick() has been called.
+        fixed_dt (float) - Time (in seconds) simulated by each state update. Set by the update_rate setting.
+        accumulator (float) - Time (in seconds) that has passed but has not been simulated by an update yet.
         events (List[pygame.event.Event]) - List of events.
+        shutdown_requested (bool) - Set to stop the program loop at the end of the current frame, e.g. by a signal
+            handler. Unlike running, it is never reset by run().
+        foregrounded (bool) - False while the window is minimized or the app is in the background.
     """
 
     def __init__(self) -> None:
@@ -51,28 +69,36 @@ class Program:
         self.background_color: pygame.Color = self.settings['background_color']
         self.fullscreen: bool = self.settings['fullscreen']
         self.screen_size: tuple[int, int] = get_display_size() if self.fullscreen else self.settings['screen_size']
+        self.vsync: bool = self.settings.get('vsync', False)
 
         # Clock settings
-        self.fps: int = self.settings['fps']
+        self.fps: int = self.settings['fps']  # 0 means the frame rate is not capped by the clock
+        self.update_rate: int = self.settings.get('update_rate', 60)
 
         # Check for valid settings
         self._validate_settings()
 
         # Objects
-        self.screen: pygame.Surface = pygame.display.set_mode(self.screen_size); logger.info("Screen initialized")
+        self.screen: pygame.Surface = self._create_screen(); logger.info("Screen initialized")
+        self.background: pygame.Surface = self._create_background(); logger.info("Background initialized")
         self.clock: pygame.time.Clock = pygame.time.Clock(); logger.info("Clock initialized")
         self.state_manager: StateManager = StateManager(); logger.info("State machine initialized")
 
         # Window attributes
-        self.icon = pygame.image.load("src/Assets/Images/icon.png")
+        self.icon: Optional[pygame.Surface] = None  # Loaded in run() so init does not wait on disk and PNG decoding
+        self._icon_path: str = "src/Assets/Images/icon.png"
         self.title = self.settings['title']
 
         # Clock attributes
         self.dt: float = 0  # Measured in seconds; amount of time since last clock.tick() call.
+        self.fixed_dt: float = 1 / self.update_rate  # Measured in seconds; time simulated by each update() call.
+        self.accumulator: float = 0  # Measured in seconds; elapsed time that has not been simulated yet.
 
         # Events
         self.events: List[pygame.event.Event] = []
         self.running: bool = False
+        self.shutdown_requested: bool = False  # Checked by the program loop; never reset once set
+        self.foregrounded: bool = True  # False while the window is minimized or the app is in the background
 
         # Program attributes
         self.exit_code = 0
@@ -127,8 +153,9 @@ class Program:
         except Exception as e:
             logger.error(f"Error while cleaning up resources for state manager: {e}")
 
-        # Exit modules
+        # Exit modules. The display may change before another Program is created, so its cached size is cleared.
         pygame.quit()
+        invalidate_display_size()
         logger.info(f"Modules exited successfully.")
 
     def run(self) -> int:
@@ -143,50 +170,157 @@ class Program:
         logger.info("Program started!")
 
         # Set window attributes
+        if self.icon is None:
+            self.icon = pygame.image.load(self._icon_path).convert_alpha()
         pygame.display.set_icon(self.icon)
         pygame.display.set_caption(self.title)
 
+        # Bind frequently used attributes to locals so the loop does not look them up every frame
+        state_manager: StateManager = self.state_manager
+        screen: pygame.Surface = self.screen
+        background: pygame.Surface = self.background
+        fps: int = self.fps
+        fixed_dt: float = self.fixed_dt
+        # Always allow at least one update's worth of time, or slow update rates would never update
+        max_accumulated_time: float = max(MAX_ACCUMULATED_TIME, fixed_dt)
+        get_events = pygame.event.get
+        wait_event = pygame.event.wait
+        update_display = pygame.display.update
+        flip_display = pygame.display.flip
+        blit_screen = screen.blit
+        tick = self.clock.tick
+
+        # Areas drawn last frame. None if the whole screen was drawn.
+        dirty_rects: Optional[List[pygame.Rect]] = None
+
+        # shutdown_requested is checked with running, so a request made before or during the loop is never lost
         self.running = True
         try:
-            while self.running:
-                # Get events
-                self.events = pygame.event.get()
-
-                # Determine if the program is exiting. Used in case the state event check fails.
-                event_types: set[int] = {event.type for event in self.events}
-                if pygame.QUIT in event_types:
-                    self.running = False
+            while self.running and not self.shutdown_requested:
+                # Get events, the only queue read each frame. In the background, wait for an event instead.
+                if self.foregrounded:
+                    events: List[pygame.event.Event] = get_events()
+                else:
+                    event: pygame.event.Event = wait_event(BACKGROUND_WAIT_MS)
+                    events: List[pygame.event.Event] = [event] + get_events() if event.type != NOEVENT else []
+                self.events = events
+
+                # Determine if the program is exiting or moving in or out of the background
+                for event in events:
+                    event_type: int = event.type
+                    if event_type == QUIT:
+                        self.running = False
+                    elif event_type in BACKGROUND_EVENTS:
+                        self.foregrounded = False
+                        logger.info("Program moved to the background")
+                    elif event_type in FOREGROUND_EVENTS and not self.foregrounded:
+                        self.foregrounded = True
+                        dirty_rects = None  # The whole screen needs to be drawn again
+
+                        # Restart the clock so the time spent in the background is not simulated on the next frame
+                        tick()
+                        self.accumulator = 0
+                        logger.info("Program moved to the foreground")
+
+                # The current state can only change in change_state(), so it is looked up once per frame
+                state: State = state_manager.current_state
 
                 # Handle events
-                self.state_manager.current_state.handle_events(self.events)
-
-                # Update objects
-                self.state_manager.current_state.update()
-
-                # Draw frame
-                self.screen.fill(self.background_color)
-                self.state_manager.current_state.draw(self.screen)
+                state.handle_events(events)
+
+                # Skip updating and drawing while in the background. Time spent there is not simulated.
+                if not self.foregrounded:
+                    if state_manager.change_state():
+                        self.running = False
+                        break
+
+                    self.accumulator = 0
+                    continue
+
+                # Update objects at a fixed rate, independent of the frame rate
+                accumulator: float = self.accumulator
+                while accumulator >= fixed_dt:
+                    state.update(fixed_dt)
+                    accumulator -= fixed_dt
+                self.accumulator = accumulator
+
+                # Clear the frame. If the state reported what it drew last frame, only those areas are cleared.
+                if dirty_rects is None:
+                    blit_screen(background, (0, 0))
+                else:
+                    for rect in dirty_rects:
+                        blit_screen(background, rect, rect)
+
+                # Draw frame. alpha is how far (0 to 1) the frame is between the last update and the next one.
+                drawn_rects: Optional[List[pygame.Rect]] = state.draw(screen, accumulator / fixed_dt)
 
                 # Change states
-                quit_occurred: int = self.state_manager.change_state()
+                quit_occurred: int = state_manager.change_state()
                 if quit_occurred:
                     self.running = False
                     break
 
-                # Update display
-                pygame.display.update()
-                self.dt = self.clock.tick(self.fps) / 1000 # tick() returns milliseconds; convert to seconds
+                # Update display. Only the cleared and newly drawn areas are sent when both frames reported them.
+                if drawn_rects is None or dirty_rects is None:
+                    flip_display()
+                else:
+                    update_display(dirty_rects + drawn_rects)
+                dirty_rects = drawn_rects
+                self.dt = tick(fps) / 1000 # tick() returns milliseconds; convert to seconds
+
+                # Limit the time carried over so a long frame cannot cause a growing number of catch-up updates
+                self.accumulator = min(self.accumulator + self.dt, max_accumulated_time)
         except Exception:
             logger.exception("Fatal error in program loop. Exiting...")
 
             # Error exit code
             self.exit_code = 1
-        finally:
-            # Break the program loop
-            logger.info("Breaking loop...")
 
-            # Return exit code
-            return self.exit_code
+        # Break the program loop
+        logger.info("Breaking loop...")
+
+        # Return exit code
+        return self.exit_code
+
+    def _create_screen(self) -> pygame.Surface:
+        """
+        Creates the program window using the fullscreen and vsync settings. With vsync off, frames are shown as soon
+        as they are drawn instead of waiting for the display to refresh. This can cause tearing. PyGame only honors
+        vsync with the SCALED or OPENGL flags, so SCALED is added when vsync is on. SCALED renders through the GPU and
+        scales the screen surface to the window.
+
+        Returns:
+            pygame.Surface: The display surface.
+        """
+
+        flags: int = FULLSCREEN if self.fullscreen else 0
+
+        # Some drivers and display modes cannot use vsync. Fall back to a window without it.
+        try:
+            return pygame.display.set_mode(self.screen_size, flags | SCALED if self.vsync else flags,
+                                           vsync=int(self.vsync))
+        except pygame.error as e:
+            if not self.vsync:
+                raise
+
+            logger.warning(f"Unable to enable vsync, continuing without it: {e}")
+            self.vsync = False
+
+            return pygame.display.set_mode(self.screen_size, flags, vsync=0)
+
+    def _create_background(self) -> pygame.Surface:
+        """
+        Renders the background once so each frame can be cleared by copying it to the screen. The surface is
+        converted to the screen's pixel format so copies do not need any conversion.
+
+        Returns:
+            pygame.Surface: The background surface.
+        """
+
+        background: pygame.Surface = pygame.Surface(self.screen.get_size()).convert()
+        background.fill(self.background_color)
+
+        return background
 
     def _validate_settings(self) -> None:
         """
@@ -207,18 +341,30 @@ class Program:
         if not is_boolean(self.fullscreen):
             raise TypeError(f"Program fullscreen setting is not a boolean. "
                             f"Value given: {self.fullscreen}")
-        if not is_sequence(self.screen_size, 2):
-            raise ValueError(f"Program screen size is not a sequence of two values. Given sequence: {self.screen_size}")
-        for dimension in self.screen_size:
-            if not is_integer(dimension):
-                raise TypeError(f"Program screen size dimension is not an integer. "
-                                f"Value given: {dimension}")
-            if not is_positive(dimension):
-                raise ValueError(f"Program screen size dimension is not positive. "
-                                 f"Value given: {dimension}")
+        if not is_boolean(self.vsync):
+            raise TypeError(f"Program vsync setting is not a boolean. "
+                            f"Value given: {self.vsync}")
+        # In fullscreen the screen size comes from the display itself, so it does not need to be checked
+        if not self.fullscreen:
+            if not is_sequence(self.screen_size, 2):
+                raise ValueError(f"Program screen size is not a sequence of two values. "
+                                 f"Given sequence: {self.screen_size}")
+            for dimension in self.screen_size:
+                if not is_integer(dimension):
+                    raise TypeError(f"Program screen size dimension is not an integer. "
+                                    f"Value given: {dimension}")
+                if not is_positive(dimension):
+                    raise ValueError(f"Program screen size dimension is not positive. "
+                                     f"Value given: {dimension}")
         if not is_integer(self.fps):
             raise TypeError(f"Program fps setting is not an integer. "
                              f"Value given: {self.fps}")
-        if not is_positive(self.fps):
-            raise ValueError(f"Program fps setting is not positive. "
-                             f"Value given: {self.fps}")
\ No newline at end of file
+        if not is_positive(self.fps, zero_is_positive=True):
+            raise ValueError(f"Program fps setting is negative. "
+                             f"Value given: {self.fps}")
+        if not is_integer(self.update_rate):
+            raise TypeError(f"Program update rate setting is not an integer. "
+                            f"Value given: {self.update_rate}")
+        if not is_positive(self.update_rate):
+            raise ValueError(f"Program update rate setting is not positive. "
+                             f"Value given: {self.update_rate}")
\ No newline at end of file
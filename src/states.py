@@ -9,20 +9,52 @@ windows. The State objects control event handling, updating objects, and drawing
 from abc import ABC, abstractmethod
 import logging
 import pygame
-from typing import Callable, Dict, List, Optional
+from pygame import KEYDOWN, KEYUP, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION, MOUSEWHEEL, QUIT
+from typing import Callable, ClassVar, Dict, List, Optional, Tuple, Type, Union
 
 # Initialize modules
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Event types at or above this are dispatched through a dictionary instead of a list, so handling a user event or
+# VIDEORESIZE (0x8000 and up) does not create a list with tens of thousands of entries.
+DISPATCH_LIST_LIMIT: int = 0x1000
+
+# High-rate events that are blocked from the event queue while the current state does nothing with them. Every other
+# event type is always allowed.
+BLOCKABLE_EVENTS: Tuple[int, ...] = (MOUSEMOTION,)
+
+# Sentinel for State.next_state that exits the program loop
+QUIT_STATE: object = object()
+
 # Define State class
 class State(ABC):
     """
     Base class for all states.
 
     Attr:
-        next_state (str): Used by the StateManager to transition between states.
+        next_state (Optional[Union[State, object]]): The next state object, or QUIT_STATE to exit. Used by the
+            StateManager to transition between states.
+        manager (Optional[StateManager]): The StateManager holding this state. Set by the StateManager.
+        _HANDLER_MAP (ClassVar[Dict[int, str]]): Maps event types to the names of their handler methods. Subclasses
+            can handle more events by extending it, e.g. {**State._HANDLER_MAP, pygame.VIDEORESIZE: 'handle_resize'}.
+
+    Event filtering:
+        While a state is active, the StateManager blocks the types in BLOCKABLE_EVENTS (MOUSEMOTION) unless the
+        state overrides their handler (e.g. handle_mousemotion), handle_events or _unhandled_method. Blocked events
+        are dropped by SDL and never reach the state. All other event types, including posted and timer events, are
+        always delivered.
     """
 
+    _HANDLER_MAP: ClassVar[Dict[int, str]] = {
+        QUIT: 'quit',
+        KEYDOWN: 'handle_keydown',
+        KEYUP: 'handle_keyup',
+        MOUSEBUTTONDOWN: 'handle_mousebuttondown',
+        MOUSEBUTTONUP: 'handle_mousebuttonup',
+        MOUSEMOTION: 'handle_mousemotion',
+        MOUSEWHEEL: 'handle_mousewheel'
+    }
+
     def __init__(self) -> None:
         """
         Creates a State instance.
@@ -32,18 +64,14 @@ class State(ABC):
         """
 
         # State attributes
-        self.next_state: Optional[str] = None
-
-        # Event handlers
-        self.handlers: Dict[int, Callable[[pygame.event.Event], None]] = {
-            pygame.QUIT: self.quit,
-            pygame.KEYDOWN: self.handle_keydown,
-            pygame.KEYUP: self.handle_keyup,
-            pygame.MOUSEBUTTONDOWN: self.handle_mousebuttondown,
-            pygame.MOUSEBUTTONUP: self.handle_mousebuttonup,
-            pygame.MOUSEMOTION: self.handle_mousemotion,
-            pygame.MOUSEWHEEL: self.handle_mousewheel
-        }
+        self.next_state: Optional[Union[State, object]] = None
+        self.manager: Optional[StateManager] = None
+
+        # Event handlers, used by handle_events(). Types below DISPATCH_LIST_LIMIT are looked up in a list indexed by
+        # event type; larger types, such as VIDEORESIZE and user events, are looked up in a dictionary.
+        self._dispatch: List[Callable[[pygame.event.Event], None]]
+        self._dispatch_extra: Dict[int, Callable[[pygame.event.Event], None]]
+        self._dispatch, self._dispatch_extra = self._build_dispatch()
 
     @abstractmethod
     def cleanup(self) -> None:
@@ -58,6 +86,8 @@ class State(ABC):
     def handle_events(self, events: List[pygame.event.Event]) -> None:
         """
         Base method for event handling. It does not need to be updated unless special events require handling.
+        The events are read once per frame by Program.run. States should use this list instead of calling
+        pygame.event.get() or pygame.event.pump() themselves.
 
         Args:
             events (List[pygame.event.Event]): List of PyGame events.
@@ -65,20 +95,51 @@ class State(ABC):
         Returns:
             None.
         """
+        dispatch: List[Callable[[pygame.event.Event], None]] = self._dispatch
+        dispatch_size: int = len(dispatch)
+        get_extra_handler: Callable = self._dispatch_extra.get
+        unhandled_method: Callable[[pygame.event.Event], None] = self._unhandled_method
+
+        # Event types past the end of the list are looked up in the dictionary
         for event in events:
-            handler: Callable[[pygame.event.Event], None] = (
-                self.handlers.get(
-                    event.type,
-                    self._unhandled_method
-                )
-            )
+            event_type: int = event.type
+            if event_type < dispatch_size:
+                dispatch[event_type](event)
+            else:
+                get_extra_handler(event_type, unhandled_method)(event)
+
+    def _build_dispatch(self) -> Tuple[List[Callable[[pygame.event.Event], None]],
+                                       Dict[int, Callable[[pygame.event.Event], None]]]:
+        """
+        Builds the handler lookups from _HANDLER_MAP. The core SDL event types are small integers, so indexing a list
+        avoids hashing each event type. The list only goes up to the largest handled type below DISPATCH_LIST_LIMIT;
+        larger types go in a dictionary so they do not grow the list.
 
-            handler(event)
+        Returns:
+            Tuple[List[Callable], Dict[int, Callable]]: Handlers indexed by event type, and handlers for event types
+            of DISPATCH_LIST_LIMIT or more.
+        """
+        handler_map: Dict[int, str] = self._HANDLER_MAP
+        dispatch_size: int = max((event_type for event_type in handler_map if event_type < DISPATCH_LIST_LIMIT),
+                                 default=-1) + 1
+
+        dispatch: List[Callable[[pygame.event.Event], None]] = [self._unhandled_method] * dispatch_size
+        dispatch_extra: Dict[int, Callable[[pygame.event.Event], None]] = {}
+        for event_type, name in handler_map.items():
+            if event_type < DISPATCH_LIST_LIMIT:
+                dispatch[event_type] = getattr(self, name)
+            else:
+                dispatch_extra[event_type] = getattr(self, name)
+
+        return dispatch, dispatch_extra
 
     @abstractmethod
-    def update(self) -> None:
+    def update(self, dt: float) -> None:
         """
-        Base method for updating objects.
+        Base method for updating objects. Called at a fixed rate, so dt is the same on every call.
+
+        Args:
+            dt (float): Time (in seconds) to advance the state by.
 
         Returns:
             None.
@@ -86,15 +147,18 @@ class State(ABC):
         pass
 
     @abstractmethod
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float) -> Optional[List[pygame.Rect]]:
         """
         Base class for rendering.
 
         Args:
             screen (pygame.Surface): PyGame display surface.
+            alpha (float): How far (0 to 1) the frame is between the last update and the next one. Can be used to
+                interpolate positions for smooth movement.
 
         Returns:
-            None.
+            Optional[List[pygame.Rect]]: The areas of the screen that were drawn to. Only these areas are cleared and
+            updated on the next frame. Return None to clear and update the whole screen.
         """
         pass
 
@@ -172,7 +236,7 @@ class State(ABC):
 
     def quit(self, event: Optional[pygame.event.Event] = None) -> None:
         """
-        Quits the program by setting next_state to 'quit'.
+        Quits the program by setting next_state to QUIT_STATE.
 
         Args:
             event (Optional[pygame.event.Event]): The PyGame event. None by default.
@@ -181,7 +245,7 @@ class State(ABC):
             None.
         """
         logger.debug("Quit event detected")
-        self.next_state = 'quit'
+        self.next_state = QUIT_STATE
 
     def _unhandled_method(self, event: pygame.event.Event) -> None:
         """
@@ -193,14 +257,16 @@ class State(ABC):
         Returns:
             None
         """
-        logger.debug(f"Unhandled event: {event.type}")
+        # Only built when debugging. Checked per call, as logging is configured after this module is imported
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Unhandled event: %d", event.type)
 
 class MenuState(State):
     """
     Handles controls and drawing of the menu. Inherits State class.
 
     Attributes:
-        next_state (str): Used by StateManager to handle state changes.
+        next_state (Optional[Union[State, object]]): Used by StateManager to handle state changes.
     """
 
     def __init__(self) -> None:
@@ -226,23 +292,27 @@ class MenuState(State):
         """
         pass
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float) -> Optional[List[pygame.Rect]]:
         """
         Handles drawing for the menu state.
 
         Args:
             screen (pygame.Surface): PyGame display surface.
+            alpha (float): How far (0 to 1) the frame is between the last update and the next one.
 
         Returns:
-            None.
+            Optional[List[pygame.Rect]]: None, so the whole screen is updated.
 
         """
         pass
 
-    def update(self) -> None:
+    def update(self, dt: float) -> None:
         """
         Updates objects for the menu state.
 
+        Args:
+            dt (float): Time (in seconds) to advance the state by.
+
         Returns:
             None.
         """
@@ -253,7 +323,9 @@ class StateManager:
     StateManager holds and manages all states of the program and transitions between states.
 
     Attr:
-        self.states (Dict[str, Optional[State]]): A dictionary that matches state names with their classes.
+        states (Tuple[State, ...]): The state objects. The first one is the starting state.
+        states_by_class (Dict[Type[State], State]): Matches state classes with their objects. States use it through
+            State.manager to pick their next state, e.g. self.next_state = self.manager.states_by_class[MenuState].
         current_state (State): The current state object being utilized.
     """
 
@@ -266,13 +338,20 @@ class StateManager:
         """
 
         # State attributes
-        self.MENU_KEY: str = 'menu'
-        self.QUIT_KEY: str = 'quit'
-        self.states: dict[str, Optional[State]] = {
-            self.MENU_KEY: MenuState(),
-            self.QUIT_KEY: None # Only used for exiting the game loop. Don't set another state to None.
+        self.states: Tuple[State, ...] = (
+            MenuState(),
+        )
+        self.states_by_class: Dict[Type[State], State] = {type(state): state for state in self.states}
+        self.current_state: State = self.states[0]
+
+        for state in self.states:
+            state.manager = self
+
+        # Event types each state does not use. Built once so state changes only have to update the event filter.
+        self._blocked_events: Dict[State, List[int]] = {
+            state: self._get_blocked_events(state) for state in self.states
         }
-        self.current_state: State = self.states[self.MENU_KEY]
+        self._filter_events(self.current_state)
 
         # Finish initialization
         logger.debug(f"State list: {self.states}")
@@ -284,39 +363,83 @@ class StateManager:
 
         Returns:
             int: 0 if the state has not changed or has been changed properly. 1 if the program is quitting or an error occurred.
-
-        Raises:
-            KeyError: If current_state.next_state is not one of the keys in StateManager.states.
         """
 
-        # Determine if a state change is occurring
-        if self.current_state.next_state is not None:
-            # Get next state key. Must match key of StateManager.states
-            new_state_key: str = self.current_state.next_state
-            logger.info(f"Changing to state '{new_state_key}'")
+        # Determine if a state change is occurring. next_state holds the state object itself, so no lookup is needed.
+        new_state: Optional[State] = self.current_state.next_state
+        if new_state is None:
+            return 0
+        if new_state is QUIT_STATE:
+            return 1
 
-            if new_state_key not in self.states:
-                logger.error(f"State key '{new_state_key}' is not a valid state")
-                return 1
+        logger.info(f"Changing to state '{new_state.__class__.__name__}'")
 
-            if new_state_key == self.QUIT_KEY:
-                return 1
+        if new_state not in self._blocked_events:
+            logger.error(f"State '{new_state!r}' is not managed by the state manager")
+            return 1
 
-            self.current_state = self.states[new_state_key]
-            self.current_state.next_state = None
+        self.current_state = new_state
+        new_state.next_state = None
+        self._filter_events(new_state)
 
-            logger.debug(f"State changed to class '{self.current_state.__class__.__name__}'")
+        logger.debug(f"State changed to class '{new_state.__class__.__name__}'")
 
         return 0
 
+    def _filter_events(self, state: State) -> None:
+        """
+        Blocks the event types that a state does not use from the event queue, so SDL drops them before they reach
+        Python. Every other event type is allowed.
+
+        Args:
+            state (State): The state to filter events for.
+
+        Returns:
+            None.
+        """
+
+        blocked_events: List[int] = self._blocked_events[state]
+
+        pygame.event.set_allowed(None)
+        if blocked_events:
+            pygame.event.set_blocked(blocked_events)
+
+        logger.debug(f"Blocked events for '{state.__class__.__name__}': {blocked_events}")
+
+    @staticmethod
+    def _get_blocked_events(state: State) -> List[int]:
+        """
+        Determines which of the BLOCKABLE_EVENTS a state does not use. An event is unused if its handler in
+        _HANDLER_MAP is not overridden from State, or it has no handler and _unhandled_method is not overridden.
+        Nothing is blocked if the state overrides handle_events.
+
+        Args:
+            state (State): The state to check.
+
+        Returns:
+            List[int]: The event types to block.
+        """
+
+        state_class: type = type(state)
+        if state_class.handle_events is not State.handle_events:
+            return []
+
+        blocked_events: List[int] = []
+
+        for event_type in BLOCKABLE_EVENTS:
+            name: str = state._HANDLER_MAP.get(event_type, '_unhandled_method')
+            if getattr(state_class, name) is getattr(State, name, None):
+                blocked_events.append(event_type)
+
+        return blocked_events
+
     def cleanup(self) -> None:
         """
         Ensures all states have exited properly.
         """
-        for state in self.states.values():
-            if state is not None:
-                try:
-                    state.cleanup()
-                except Exception as e:
-                    logger.exception(f"An exception has occurred while cleaning up resources for "
-                                     f"{state.__class__.__name__}. Exception: {e}")
\ No newline at end of file
+        for state in self.states:
+            try:
+                state.cleanup()
+            except Exception as e:
+                logger.exception(f"An exception has occurred while cleaning up resources for "
+                                 f"{state.__class__.__name__}. Exception: {e}")
\ No newline at end of file